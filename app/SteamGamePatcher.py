@@ -8,7 +8,6 @@ import tkinter.font as tkfont
 from tkinter import ttk, messagebox, scrolledtext
 from pathlib import Path
 from io import BytesIO
-import requests
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import tempfile
 import logging
@@ -17,12 +16,21 @@ import threading
 import queue
 import shutil
 import webbrowser
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import uuid # For safe temp dirs if needed
 import platform # For OS checks if needed
 import zipfile # Built-in for ZIP
-import gdown
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re # for progress parsing
+import importlib.util
+import email.utils
+import urllib.request
+import urllib.error
+import mmap
+import zlib
+import gzip
+import ctypes
+import filecmp
 
 # --- Imports for Enhanced DOCX Rendering ---
 try:
@@ -36,66 +44,235 @@ try:
 except ImportError:
     pass
 
+# Optional: faster JSON parsing/encoding (falls back to json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def json_dumps_bytes(obj):
+    """Compact UTF-8 JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def json_dumps_pretty(obj):
+    """Indented UTF-8 JSON bytes for files users may open (orjson indents by 2)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=4).encode('utf-8')
+
 APP_VERSION = '1.38-beta'
 CONFIG_FILENAME = 'patcher_config.json'  # Per-game config file
+DB_URL = "https://raw.githubusercontent.com/d4rksp4rt4n/SteamGamePatcher/refs/heads/main/database/data/patches_database.json"
+DB_PATH = Path('data/patches_database.json')
+ETAG_PATH = DB_PATH.parent / 'patches_database.etag'
+CACHE_INDEX_FILENAME = 'index.json'  # {file_id: {size, crc32, mtime, verified_at}} in cache/
+CACHE_VERIFY_MAX_AGE = 7 * 24 * 3600  # Re-verify cached archives after a week
+CACHE_PARTIAL_PREFIX = 'partial-'  # In-flight downloads; renamed to <id>_<name> once verified
+CACHE_ID_KEYED_MARKER = '.id-keyed'  # Present once pre-id (<name>-keyed) cache files were migrated
+BOXART_CACHE_SIZE = 64  # Rendered box art PhotoImages kept in memory (LRU)
+GDRIVE_DOWNLOAD_URL = "https://drive.usercontent.google.com/download"
+RANGED_MIN_BYTES = 16 * 1024 * 1024  # Below this a single stream is as fast as splitting
+RANGED_WORKERS = 6
+RANGED_RETRIES = 3  # Per-range retries on 429/503 before falling back to gdown
+RETRY_AFTER_MAX = 60  # Cap on a server-requested wait, in seconds
+PATCH_DOWNLOAD_WORKERS = 3  # Selected patch files downloaded concurrently; extraction stays serial
+COPY_WORKERS = 8  # Parallel file copies when applying a patch
+# ASCII A-Z -> a-z table; bytes.translate folds names in C without allocating a new str
+_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+def fold_name(name):
+    """Case-fold a file name into a bytes key for case-insensitive matching.
+
+    The bytes.translate fast path only folds A-Z, so non-ASCII names go through str.lower().
+    """
+    if name.isascii():
+        return name.encode('ascii').translate(_LOWER)
+    return name.lower().encode('utf-8', 'surrogateescape')
 
 def flatten_game_contents(contents):
     """Flatten contents from last_folders.json into the flat 'files' list the app expects.
     Supports old dict format and new flat list format from the indexer.
     """
     flat_files = []
-    
-    def recurse(items, current_path=""):
+
+    def children_of(items):
+        # Legacy dicts yield (name, data); flat lists yield (None, data)
         if isinstance(items, dict):
+            return iter(items.items())
+        if isinstance(items, list):
+            return ((None, item_data) for item_data in items)
+        return iter(())
+
+    # Explicit stack of iterators: same depth-first order as recursion, no frame per folder
+    stack = [(children_of(contents), "")] if contents else []
+    while stack:
+        items, current_path = stack[-1]
+        nxt = next(items, None)
+        if nxt is None:
+            stack.pop()
+            continue
+        item_name, item_data = nxt
+        if not isinstance(item_data, dict):
+            continue
+        if item_name is not None:
             # Old nested dict format (legacy)
-            for item_name, item_data in items.items():
-                if not isinstance(item_data, dict):
-                    continue
-                if item_data.get("type") == "file":
-                    display_path = f"{current_path}/{item_name}" if current_path else item_name
-                    flat_files.append({
-                        "name": item_name,
-                        "path": display_path,
-                        "id": item_data.get("id"),
-                        "mimeType": item_data.get("mimeType"),
-                        "size": item_data.get("size", "Unknown")
-                    })
-                elif item_data.get("type") == "folder" and "children" in item_data:
-                    new_path = f"{current_path}/{item_name}" if current_path else item_name
-                    recurse(item_data.get("children", {}), new_path)
-
-        elif isinstance(items, list):
-            # New flat list format (current)
-            for item_data in items:
-                if not isinstance(item_data, dict):
-                    continue
-                
-                item_name = item_data.get("name") or item_data.get("filename")
-                if not item_name or not item_data.get("id"):
-                    continue
-                
-                # Accept ANY item that has an "id" — type can be ".exe", ".zip", "file", None, etc.
+            if item_data.get("type") == "file":
                 display_path = f"{current_path}/{item_name}" if current_path else item_name
                 flat_files.append({
                     "name": item_name,
                     "path": display_path,
                     "id": item_data.get("id"),
                     "mimeType": item_data.get("mimeType"),
-                    "size": item_data.get("size", item_data.get("raw_size", "Unknown"))
+                    "size": item_data.get("size", "Unknown")
                 })
+            elif item_data.get("type") == "folder" and "children" in item_data:
+                new_path = f"{current_path}/{item_name}" if current_path else item_name
+                stack.append((children_of(item_data.get("children", {})), new_path))
+            continue
 
-                # If there are ever real subfolders with "children", handle them too
-                if item_data.get("type") == "folder" and "children" in item_data:
-                    new_path = f"{current_path}/{item_name}" if current_path else item_name
-                    recurse(item_data.get("children", []), new_path)
+        # New flat list format (current)
+        item_name = item_data.get("name") or item_data.get("filename")
+        if not item_name or not item_data.get("id"):
+            continue
+
+        # Accept ANY item that has an "id" — type can be ".exe", ".zip", "file", None, etc.
+        display_path = f"{current_path}/{item_name}" if current_path else item_name
+        flat_files.append({
+            "name": item_name,
+            "path": display_path,
+            "id": item_data.get("id"),
+            "mimeType": item_data.get("mimeType"),
+            "size": item_data.get("size", item_data.get("raw_size", "Unknown")),
+            "raw_size": item_data.get("raw_size")  # exact byte count from the indexer
+        })
+
+        # If there are ever real subfolders with "children", handle them too
+        if item_data.get("type") == "folder" and "children" in item_data:
+            new_path = f"{current_path}/{item_name}" if current_path else item_name
+            stack.append((children_of(item_data.get("children", [])), new_path))
 
-    if contents:
-        recurse(contents)
-    
     # Sort for consistent UI order
     flat_files.sort(key=lambda f: f['name'].lower())
     return flat_files
 
+# Larger buffer for shutil's Python read/write fallback (default is 64 KiB off Windows)
+shutil.COPY_BUFSIZE = 1 << 20
+COPY_FILE_NO_BUFFERING = 0x00001000  # CopyFileExW flag: bypass the file cache
+NO_BUFFERING_MIN_BYTES = 8 * 1024 * 1024
+
+def fast_copy(src, dst):
+    """Copy a file with metadata in one kernel call where possible.
+
+    Windows uses CopyFileExW (unbuffered for large files so big patches don't evict
+    the page cache); elsewhere shutil.copy2 already goes through os.sendfile.
+    """
+    if sys.platform == 'win32':
+        flags = COPY_FILE_NO_BUFFERING if os.path.getsize(src) >= NO_BUFFERING_MIN_BYTES else 0
+        if ctypes.windll.kernel32.CopyFileExW(str(src), str(dst), None, None, None, flags):
+            shutil.copystat(src, dst)
+            return dst
+        logging.debug("CopyFileExW failed (%d), falling back to copy2: %s", ctypes.GetLastError(), src)
+    return shutil.copy2(src, dst)
+
+def needs_copy(src, dst):
+    """False when dst already holds exactly src's bytes, so the write can be skipped.
+
+    With shallow=True filecmp trusts a matching (type, size, mtime) signature -- copy2
+    preserves mtime, so re-applied patches never read either file. Only same-size files
+    with differing mtimes get a content compare; different sizes never read either file.
+    """
+    try:
+        return not filecmp.cmp(src, dst, shallow=True)
+    except OSError:
+        return True
+
+def copy_if_changed(src, dst):
+    """fast_copy unless dst is already identical; returns whether anything was written."""
+    if not needs_copy(src, dst):
+        return False
+    fast_copy(src, dst)
+    return True
+
+def remove_quietly(path):
+    """Best-effort unlink; a file still held open (e.g. by an orphaned download on Windows) stays for later cleanup."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        logging.debug("Could not remove %s: %s", path, e)
+
+def retry_after_seconds(value, default):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), capped."""
+    if value:
+        try:
+            return min(max(float(value), 0), RETRY_AFTER_MAX)
+        except ValueError:
+            try:
+                delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+                return min(max(delay, 0), RETRY_AFTER_MAX)
+            except (TypeError, ValueError):
+                pass
+    return default
+
+def ensure_module(module_name, pip_name=None):
+    """pip-install a dependency if missing, ahead of its function-local import.
+
+    Callers keep a literal `import x` so PyInstaller still bundles it; frozen builds
+    never install (sys.executable there is the app itself, not python).
+    """
+    if getattr(sys, 'frozen', False) or importlib.util.find_spec(module_name) is not None:
+        return
+    logging.info("Installing missing dependency: %s", pip_name or module_name)
+    subprocess.call([sys.executable, "-m", "pip", "install", pip_name or module_name])
+    importlib.invalidate_caches()
+
+def quick_crc(path):
+    """CRC32 of a file via a read-only memory map (no subprocess, no read copies)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return zlib.crc32(mm)
+
+def last_percent(chunk):
+    """Return the last 'NN%' value in a raw 7z progress chunk, or None."""
+    end = chunk.rfind(b'%')
+    start = end
+    while start > 0 and 48 <= chunk[start - 1] <= 57:  # ASCII digits
+        start -= 1
+    if start == end:
+        return None
+    return int(chunk[start:end])
+
+# Redistributable installers bundled with games; patches never target them
+_SKIP_GAME_DIRS = frozenset({"_commonredist", "directx", "vcredist", "redist", "__macosx"})
+
+def index_game_files(install_dir, needed=None):
+    """Map folded file name -> full paths under install_dir, skipping redistributable subtrees.
+
+    With `needed` (a set of folded names) only those names are recorded. The whole tree is
+    still walked, since a second hit for a name is what marks it as ambiguous.
+    """
+    game_files = defaultdict(list)
+    stack = [str(install_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in _SKIP_GAME_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        key = fold_name(entry.name)
+                        if needed is None or key in needed:
+                            game_files[key].append(entry.path)
+        except OSError as e:
+            logging.warning("Cannot scan %s: %s", e.filename, e.strerror)
+    return game_files
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller onefile"""
     try:
@@ -110,8 +287,12 @@ def setup_logging():
     log_dir = Path('data')
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / 'patcher.log'
+    # INFO by default; set PATCHER_LOG_LEVEL=DEBUG for box art / cache / config tracing
+    level = logging.getLevelName(os.environ.get('PATCHER_LOG_LEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO
     logging.basicConfig(
-        level=logging.DEBUG,
+        level=level,
         format='%(asctime)s [%(levelname)s] %(message)s',
         handlers=[
             logging.FileHandler(log_file, encoding='utf-8'),
@@ -173,6 +354,57 @@ def ensure_7z_exe():
         messagebox.showwarning("Missing 7z files", "7z.exe or 7z.dll not found. Download from https://www.7-zip.org and place in the app folder.")
         sys.exit(1)
 
+def download_database():
+    """Conditionally fetch the patch database.
+
+    Returns the parsed new copy, or None when GitHub says it is unchanged (304).
+    Raises on failure; the local DB is only replaced by a download that parses.
+    """
+    DB_PATH.parent.mkdir(exist_ok=True)
+    # The JSON gzips ~4x; raw.githubusercontent.com only compresses when asked
+    headers = {'Accept-Encoding': 'gzip'}
+    if DB_PATH.exists():
+        age_seconds = time.time() - DB_PATH.stat().st_mtime
+        logging.info(f"Local database is {age_seconds:.0f}s old → checking GitHub via ETag")
+        headers['If-Modified-Since'] = email.utils.formatdate(DB_PATH.stat().st_mtime, usegmt=True)
+        if ETAG_PATH.exists():
+            headers['If-None-Match'] = ETAG_PATH.read_text().strip()
+    req = urllib.request.Request(DB_URL, headers=headers)
+    try:
+        resp = urllib.request.urlopen(req, timeout=15)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            logging.info("Database up to date (304)")
+            os.utime(DB_PATH)
+            return None
+        raise
+    # Stream to a temp file so a dropped connection never leaves a truncated DB behind
+    tmp_path = DB_PATH.with_suffix('.tmp')
+    try:
+        with resp:
+            logging.info(f"GitHub response: status={resp.status}, headers={dict(resp.headers)}")
+            body = gzip.GzipFile(fileobj=resp) if resp.headers.get('Content-Encoding') == 'gzip' else resp
+            with tmp_path.open('wb') as f:
+                shutil.copyfileobj(body, f, 1 << 16)
+            new_etag = resp.headers.get('ETag')
+        # Parse before the swap: a bad body must not replace a working database
+        folder_db = read_database(tmp_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, DB_PATH)
+    if new_etag:
+        ETAG_PATH.write_text(new_etag)
+    else:
+        logging.warning("No ETag in response")
+    os.utime(DB_PATH)
+    logging.info("Database updated")
+    return folder_db
+
+def read_database(path=DB_PATH):
+    raw_db = path.read_bytes()
+    return json_loads(raw_db)
+
 def get_steam_path():
     logging.info("Finding Steam...")
     try:
@@ -189,16 +421,25 @@ def get_steam_path():
             return p
     return None
 
+_SIZE_RE = re.compile(r"([\d\.]+)\s*([KMGTP]?B)", re.IGNORECASE)
+_SIZE_UNITS = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30, 'TB': 1 << 40}
+_INSTALLDIR_RE = re.compile(rb'"installdir"\s+"([^"]+)"')
+_LIBRARY_PATH_RE = re.compile(rb'"path"\s+"([^"]+)"')
+# Anchored to the line start so a numeric value followed by the next key never matches
+_LEGACY_LIBRARY_RE = re.compile(rb'^\s*"\d+"\s+"([^"]+)"', re.M)
+
 def get_installed_games(steam_path):
     installed = {}
     vdf_path = steam_path / "steamapps" / "libraryfolders.vdf"
     libs = [steam_path / "steamapps"]
     if vdf_path.exists():
         try:
-            import vdf
-            data = vdf.load(open(vdf_path, "r", encoding="utf-8"))
-            for val in data.get("libraryfolders", {}).values():
-                p = Path(val.get("path") if isinstance(val, dict) else val)
+            raw = vdf_path.read_bytes()
+            # Only the library paths are needed, so skip a full VDF parse.
+            # Old-style files map "1" "D:\\Lib" directly instead of nesting a "path" key.
+            paths = _LIBRARY_PATH_RE.findall(raw) or _LEGACY_LIBRARY_RE.findall(raw)
+            for path_bytes in paths:
+                p = Path(path_bytes.decode("utf-8", "replace").replace("\\\\", "\\"))
                 if p.is_dir():
                     libs.append(p / "steamapps")
         except:
@@ -207,49 +448,96 @@ def get_installed_games(steam_path):
         common = lib / "common"
         if not common.is_dir():
             continue
-        for acf in lib.glob("appmanifest_*.acf"):
-            appid = acf.stem.split("_")[1]
+        try:
+            with os.scandir(lib) as it:
+                acfs = [e.path for e in it if e.name.startswith("appmanifest_") and e.name.endswith(".acf")]
+        except OSError:
+            continue
+        for acf in acfs:
+            appid = os.path.basename(acf)[len("appmanifest_"):-len(".acf")]
             try:
-                with open(acf, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if '"installdir"' in line:
-                            dir_name = line.split('"')[3]
-                            full = common / dir_name
-                            if full.is_dir():
-                                installed[appid] = full
-                                logging.info(f"Game: {appid} -> {full}")
-                            break
+                m = _INSTALLDIR_RE.search(Path(acf).read_bytes())
+                if m:
+                    full = common / m.group(1).decode("utf-8", "replace")
+                    if full.is_dir():
+                        installed[appid] = full
+                        logging.debug("Game: %s -> %s", appid, full)
             except:
                 pass
     logging.info(f"Installed: {len(installed)}")
     return installed
 
-def load_box_art(steam_path, appid):
-    """Steam box art loader + fallback to no-box-art.png"""
+BOX_ART_SCAN_DEPTH = 3  # Steam's librarycache/<appid>/<hash>/ layout never goes deeper
+_BOX_ART_EXTS = ('.jpg', '.jpeg', '.png')
+_BOX_ART_NAME_RE = re.compile(r"library_600x900|capsule|header|hero")
+
+def scan_box_art_dir(path, max_depth=BOX_ART_SCAN_DEPTH):
+    """Yield (path, mtime) for art images under path level by level.
+
+    DirEntry type info avoids a stat per entry, and on Windows DirEntry.stat() is
+    served from the directory listing itself.
+
+    Stops after the first level that contains a library_600x900 image, since nothing
+    found deeper could outrank it.
+    """
+    level = [path]
+    for _ in range(max_depth):
+        next_level = []
+        found_best = False
+        for directory in level:
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    next_level.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = entry.name.lower()
+                    if name.endswith(_BOX_ART_EXTS) and _BOX_ART_NAME_RE.search(name):
+                        found_best = found_best or "library_600x900" in name
+                        yield Path(entry.path), entry.stat().st_mtime
+        if found_best or not next_level:
+            return
+        level = next_level
+
+def box_art_priority(name):
+    """Rank a Steam art filename: 600x900 > capsule > header > non-blurred hero > other."""
+    name = name.lower()
+    if "library_600x900" in name:
+        return 4
+    if "capsule" in name:
+        return 3
+    if "header" in name:
+        return 2
+    if "hero" in name and "blur" not in name:
+        return 1
+    return 0
+
+def find_box_art(steam_path, appid):
+    """Locate the best Steam box art file for appid (custom grid first), or None."""
     appid = str(appid)
-    logging.debug(f"\n=== BOX ART SEARCH FOR APPID: {appid} ===")
-    logging.debug(f"Steam path: {steam_path}")
+    logging.debug("\n=== BOX ART SEARCH FOR APPID: %s ===", appid)
+    logging.debug("Steam path: %s", steam_path)
     cache_dir = steam_path / "appcache" / "librarycache"
     userdata_dir = steam_path / "userdata"
-    candidates = []
+    candidates = []  # (path, mtime): each file is stat'ed exactly once
     custom_grid = []
     # 1. Modern flat files
     for ext in ["jpg", "jpeg", "png"]:
         p = cache_dir / f"{appid}_library_600x900.{ext}"
-        if p.exists():
-            candidates.append(p)
-            logging.debug(f"FOUND flat 600x900: {p.name}")
+        try:
+            candidates.append((p, p.stat().st_mtime))
+            logging.debug("FOUND flat 600x900: %s", p.name)
+        except OSError:
+            pass
     # 2. Legacy deep scan
     legacy_root = cache_dir / appid
-    if legacy_root.exists() and legacy_root.is_dir():
-        for root, dirs, files in os.walk(legacy_root):
-            for file in files:
-                if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    filepath = Path(root) / file
-                    name = file.lower()
-                    if any(k in name for k in ["library_600x900", "capsule", "header", "hero"]):
-                        candidates.append(filepath)
-                        logging.debug(f"FOUND in subfolder: {filepath.relative_to(cache_dir)}")
+    if legacy_root.is_dir():
+        for filepath, mtime in scan_box_art_dir(legacy_root):
+            candidates.append((filepath, mtime))
+            logging.debug("FOUND in subfolder: %s", filepath)
     # 3. Custom grid (supports .jpg too!)
     if userdata_dir.exists():
         for user in userdata_dir.iterdir():
@@ -258,38 +546,36 @@ def load_box_art(steam_path, appid):
             if grid_dir.exists():
                 for ext in ["p.png", "p.jpg", "p.jpeg"]:
                     grid_file = grid_dir / f"{appid}{ext}"
-                    if grid_file.exists():
-                        custom_grid.append(grid_file)
-                        logging.debug(f"FOUND CUSTOM GRID: {grid_file.name}")
-                        break
-    all_images = candidates + custom_grid
-    if all_images:
-        if custom_grid:
-            best = max(custom_grid, key=lambda x: x.stat().st_mtime)
-        else:
-            priorities = [
-                lambda x: "library_600x900" in x.name.lower(),
-                lambda x: "capsule" in x.name.lower(),
-                lambda x: "header" in x.name.lower(),
-                lambda x: "hero" in x.name.lower() and "blur" not in x.name.lower(),
-            ]
-            best = None
-            for cond in priorities:
-                matches = [f for f in candidates if cond(f)]
-                if matches:
-                    best = max(matches, key=lambda x: x.stat().st_mtime)
+                    try:
+                        custom_grid.append((grid_file, grid_file.stat().st_mtime))
+                    except OSError:
+                        continue
+                    logging.debug("FOUND CUSTOM GRID: %s", grid_file.name)
                     break
-            if not best:
-                best = max(candidates, key=lambda x: x.stat().st_mtime)
+    if custom_grid:
+        return max(custom_grid, key=lambda c: c[1])[0]
+    if candidates:
+        # Single pass: highest priority class wins, newest file breaks ties
+        return max(candidates, key=lambda c: (box_art_priority(c[0].name), c[1]))[0]
+    logging.debug("NO BOX ART FOUND IN STEAM → using placeholder")
+    return None
+
+def compose_box_art(best):
+    """Decode, fit and center box art onto a 200x300 PIL image, falling back to placeholders.
+
+    Pure PIL work, so it is safe to run off the Tk thread.
+    """
+    img = None
+    if best:
         try:
-            img = Image.open(best).convert("RGB")
-            logging.debug(f"Loaded real box art: {best.name}")
+            img = Image.open(best)
+            # JPEG: let libjpeg decode at a reduced scale close to 200x300 (no-op for PNG)
+            img.draft("RGB", (200, 300))
+            img = img.convert("RGB")
+            logging.debug("Loaded real box art: %s", best.name)
         except Exception as e:
             logging.warning(f"Failed to load real box art {best}: {e}")
             img = None
-    else:
-        img = None
-        logging.debug("NO BOX ART FOUND IN STEAM → using placeholder")
     # FALLBACK: use no-box-art.png from app directory
     if not img:
         placeholder_path = resource_path("no-box-art.png")
@@ -326,10 +612,24 @@ def load_box_art(steam_path, appid):
     bg = Image.new("RGB", (200, 300), (28, 28, 38))
     offset = ((200 - img.width) // 2, (300 - img.height) // 2)
     bg.paste(img, offset, img if img.mode == 'RGBA' else None)
-    photo = ImageTk.PhotoImage(bg)
     logging.debug("BOX ART READY (real or placeholder)")
     logging.debug("=== END SEARCH ===\n")
-    return photo
+    return bg
+
+def render_box_art(best):
+    """Box art as a Tk PhotoImage (must be called on the Tk thread)."""
+    return ImageTk.PhotoImage(compose_box_art(best))
+
+def box_art_key(best):
+    """Cache key for a resolved box art file: changes when the file is replaced."""
+    try:
+        return (str(best), best.stat().st_mtime) if best else None
+    except OSError:
+        return None
+
+def load_box_art(steam_path, appid):
+    """Steam box art loader + fallback to no-box-art.png"""
+    return render_box_art(find_box_art(steam_path, appid))
 
 class PatchSelectionDialog(tk.Toplevel):
     def __init__(self, parent, display_files, file_entries):
@@ -641,6 +941,7 @@ class InstructionsDialog(tk.Toplevel):
                  import shutil
                  shutil.copy(file_data['path'], self.temp_file)
             elif file_id:
+                ensure_module("gdown")
                 import gdown
                 # Blocking download call
                 gdown.download(id=file_id, output=str(self.temp_file), quiet=True, fuzzy=True)
@@ -648,8 +949,7 @@ class InstructionsDialog(tk.Toplevel):
             # Only read simple text files in the thread. 
             # Docx/PDF content must be processed in the main thread (Finalize).
             if not file_name.endswith('.docx') and not file_name.endswith('.pdf'):
-                with open(self.temp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    self.thread_content = f.read()
+                self.thread_content = self.temp_file.read_text(encoding='utf-8', errors='ignore')
 
         except Exception as e:
             self.thread_error = f"Failed to load content:\n\n{e}"
@@ -997,6 +1297,7 @@ class App(tk.Tk):
             logging.warning("icon.ico not found in resources")
      
         self.current_appid = None
+        self.current_key = None
         self.current_install_dir = None
         self.dev_var = tk.StringVar(value="")
         self.pub_var = tk.StringVar(value="")
@@ -1018,89 +1319,56 @@ class App(tk.Tk):
         help_menu.add_command(label="About...", command=lambda: AboutDialog(self, self.version))
         menubar.add_cascade(label="Help", menu=help_menu)
         self.config(menu=menubar)
-        # Auto-download database
-        DB_URL = "https://raw.githubusercontent.com/d4rksp4rt4n/SteamGamePatcher/refs/heads/main/database/data/patches_database.json"
-        DB_PATH = Path('data/patches_database.json')
-        ETAG_PATH = DB_PATH.parent / 'patches_database.etag'
-        def download_database():
-            DB_PATH.parent.mkdir(exist_ok=True)
-            headers = {}
-            if DB_PATH.exists() and ETAG_PATH.exists():
-                with ETAG_PATH.open('r') as f:
-                    etag = f.read().strip()
-                headers['If-None-Match'] = etag
+        # Start from the cached database so the window never waits on GitHub;
+        # a background refresh swaps in a newer copy once it arrives
+        folder_db = None
+        if DB_PATH.exists():
             try:
-                r = requests.get(DB_URL, headers=headers, timeout=15)
-                logging.info(f"GitHub response: status={r.status_code}, headers={r.headers}")
-                if r.status_code == 304:
-                    logging.info("Database up to date (304)")
-                    os.utime(DB_PATH)
-                    return False
-                r.raise_for_status()
-                with DB_PATH.open('w', encoding='utf-8') as f:
-                    f.write(r.text)
-                new_etag = r.headers.get('ETag')
-                if new_etag:
-                    with ETAG_PATH.open('w') as f:
-                        f.write(new_etag)
-                else:
-                    logging.warning("No ETag in response")
-                os.utime(DB_PATH)
-                logging.info("Database updated")
-                return True
+                folder_db = read_database()
             except Exception as e:
-                logging.error(f"Update failed: {e}")
-                return False
-        if not DB_PATH.exists():
-            logging.info("Database file missing → forcing download")
-            updated = download_database()
+                logging.error(f"Cached database is unreadable: {e}")
+                # Without a local copy the download below is unconditional (no ETag/304)
+                DB_PATH.unlink(missing_ok=True)
+        if folder_db is not None:
+            refresh_db = True
+            self.load_database(folder_db, "Checking for updates...")
         else:
-            age_seconds = time.time() - DB_PATH.stat().st_mtime
-            if age_seconds > 3600:
-                logging.info(f"Local database is {age_seconds:.0f}s old (>1h) → checking GitHub")
-                updated = download_database()
-            else:
-                logging.info(f"Local database is fresh ({age_seconds:.0f}s old) → checking GitHub via ETag")
-                updated = download_database()
-        if not DB_PATH.exists():
-            messagebox.showerror("No Database", "Download failed. Check internet.")
-            sys.exit(1)
-        with open(DB_PATH, 'r', encoding='utf-8') as f:
-            self.folder_db = json.load(f)
-
-        # === NEW REFACTORED DATABASE SUPPORT ===
-        if "entries" in self.folder_db:
-            # Pre-process every entry to add "files" list (backward compatible)
-            for entry in self.folder_db.get("entries", []):
-                contents = entry.get("contents")
-                if isinstance(contents, (dict, list)):
-                    entry["files"] = flatten_game_contents(contents)
-                else:
-                    entry["files"] = []
-
-            metadata = self.folder_db.get("data", {})
-            self.version = metadata.get("generated_at", "Unknown")
-
-            # ←←← NEW: Read recent_changes from the correct location
-            recent_changes = self.folder_db.get("last_folders_metadata", {}) \
-                              .get("recent_changes", [])
-
-            db_status = "Updated" if updated else "Up to date"
-            self.db_status = f"Database Version: {self.version} | Status: {db_status}"
-        else:
-            # Old structure fallback (still works)
-            metadata = self.folder_db.get('metadata', {})
-            self.version = metadata.get('version', 'Unknown')
-            recent_changes = metadata.get('recent_changes', [])
-            self.db_status = f"Database Version: {self.version} | Status: {db_status}"
-
-        self.grouped_changes = self.group_recent_changes(recent_changes)
+            logging.info("No usable database file → forcing download")
+            refresh_db = False
+            try:
+                folder_db = download_database()
+            except Exception as e:
+                logging.error(f"Update failed: {e}")
+                folder_db = None
+            if folder_db is None:
+                messagebox.showerror("No Database", "Download failed. Check internet.")
+                sys.exit(1)
+            self.load_database(folder_db, "Updated")
     
         # Cache for downloaded archives
         app_dir = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).parent
         self.cache_dir = app_dir / 'cache'
         self.cache_dir.mkdir(exist_ok=True)
         logging.info(f"Cache dir initialized: {self.cache_dir}")
+        self.cache_index = self.load_cache_index()
+        self.tidy_cache()
+        self._cache_index_lock = threading.Lock()  # Concurrent patch downloads record into the index
+        self._patch_abort = threading.Event()  # Set when a patch run fails, so concurrent fetches stop early
+        self._foreground_fetch = None  # Drive id process_patch is waiting on; only it reports progress
+        self._http = None  # Shared requests.Session, created on first ranged download
+        self._http_lock = threading.Lock()
+        # Resolve 7z once; ensure_7z_exe() has already placed it next to the app
+        self._local_7z = app_dir / '7z.exe'
+        self._has_7z = self._local_7z.exists()
+        self._no_window_flag = 0x08000000 if sys.platform == 'win32' else 0
+        if self._has_7z:
+            # Run a throwaway `7z i` so the exe/dll pages are warm in the OS cache by the first extraction
+            threading.Thread(
+                target=subprocess.run,
+                args=([str(self._local_7z), 'i'],),
+                kwargs={'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL, 'creationflags': self._no_window_flag},
+                daemon=True
+            ).start()
     
         steam = get_steam_path()
         if not steam:
@@ -1108,45 +1376,8 @@ class App(tk.Tk):
             sys.exit(1)
         self.installed = get_installed_games(steam)
         self.steam_path = steam
-        # Build matches
-                # === BUILD MATCHES - SUPPORT NEW FLAT "entries" STRUCTURE ===
-        self.matches = []
-        self.by_id = {}
-
-        entries = self.folder_db.get('entries', []) if "entries" in self.folder_db else None
-
-        if entries:  # NEW format
-            for entry in entries:
-                appid_raw = entry.get("appid")
-                if appid_raw:
-                    appid = str(appid_raw).strip()
-                    if appid in self.installed:
-                        match_info = {
-                            "dev_name": entry.get("developer", "Unknown"),
-                            "game_name": entry.get("game", "Unknown"),
-                            "data": entry
-                        }
-                        self.matches.append(match_info)
-                        self.by_id[appid] = match_info
-                        logging.info(f"MATCH: {appid} -> {match_info['game_name']} by {match_info['dev_name']}")
-        else:  # old nested format fallback
-            for dev_name, dev_data in self.folder_db.get('developers', {}).items():
-                for game_name, game_data in dev_data.get("games", {}).items():
-                    appid_raw = game_data.get("appid")
-                    if appid_raw:
-                        appid = str(appid_raw).strip()
-                        if appid in self.installed:
-                            match_info = {
-                                "dev_name": dev_name,
-                                "game_name": game_name,
-                                "data": game_data
-                            }
-                            self.matches.append(match_info)
-                            self.by_id[appid] = match_info
-                            logging.info(f"MATCH: {appid} -> {game_name} by {dev_name}")
-
-        self.matches = sorted(self.matches, key=lambda x: x['game_name'].lower())
-        logging.info(f"FOUND {len(self.matches)} matched games with patches")
+        self._boxart_cache = OrderedDict()  # appid -> ((path, mtime), PIL composite, PhotoImage or None)
+        self.build_matches()
 
         # LOAD LAST APPLIED FROM PER-GAME CONFIGS (MOVED AFTER installed + by_id)
         self.last_applied = self.load_per_game_configs()
@@ -1154,13 +1385,13 @@ class App(tk.Tk):
         old_path = Path("data") / "last_applied.json"
         if old_path.exists():
             try:
-                with open(old_path, "r", encoding="utf-8") as f:
-                    old_data = json.load(f)
+                old_data = json_loads(old_path.read_bytes())
                 self.migrate_old_to_per_game(old_data)
                 old_path.unlink()  # Clean up old file
                 logging.info("Migrated old global config to per-game configs")
             except Exception as e:
                 logging.warning(f"Failed to migrate old config: {e}")
+        self.update_match_flags()
 
         self.build_gui()
         if self.matches:
@@ -1168,30 +1399,129 @@ class App(tk.Tk):
             self.tree.selection_set(first)
             self.tree.focus(first)
             self.on_select(None)
+        # Warm the box art cache in list order (bounded by the LRU so nothing is evicted early)
+        prefetch = list(dict.fromkeys(self.by_id[key]["appid"] for key in self.tree.get_children()))[:BOXART_CACHE_SIZE]
+        threading.Thread(target=self._prefetch_box_art, args=(prefetch,), daemon=True).start()
         self.progress_frame = None
         self.ui_queue = queue.Queue()
-        self.after(100, self.process_ui_queue)
+        self._ui_last_put = {}  # (kind, widget) -> (timestamp, sent payload, held-back payload) for throttled updates
+        self._ui_pending = threading.Event()  # set while a drain is scheduled on the Tk thread
+        self.bind("<<UIQueue>>", self.process_ui_queue)
+        if refresh_db:
+            threading.Thread(target=self._refresh_db_async, daemon=True).start()
+
+    def load_database(self, folder_db, db_status):
+        """Adopt a parsed patch database: version, status line and grouped recent changes."""
+        self.folder_db = folder_db
+        # === NEW REFACTORED DATABASE SUPPORT ===
+        if "entries" in self.folder_db:
+            metadata = self.folder_db.get("data", {})
+            self.version = metadata.get("generated_at", "Unknown")
+
+            # ←←← NEW: Read recent_changes from the correct location
+            recent_changes = self.folder_db.get("last_folders_metadata", {}) \
+                              .get("recent_changes", [])
+        else:
+            # Old structure fallback (still works)
+            metadata = self.folder_db.get('metadata', {})
+            self.version = metadata.get('version', 'Unknown')
+            recent_changes = metadata.get('recent_changes', [])
+        self.db_status = f"Database Version: {self.version} | Status: {db_status}"
+        self.grouped_changes = self.group_recent_changes(recent_changes)
+
+    def build_matches(self):
+        """Match installed games against the loaded database into self.matches / self.by_id."""
+        # === BUILD MATCHES - SUPPORT NEW FLAT "entries" STRUCTURE ===
+        # One flat appid -> [(dev, game, data), ...] pass over the DB, then intersect with what's installed;
+        # an appid can carry several entries (e.g. a game and its demo) and each one gets a row
+        appid_index = {}
+        entries = self.folder_db.get('entries', []) if "entries" in self.folder_db else None
+
+        if entries:  # NEW format
+            for entry in entries:
+                appid_raw = entry.get("appid")
+                if appid_raw:
+                    appid_index.setdefault(str(appid_raw).strip(), []).append(
+                        (entry.get("developer", "Unknown"), entry.get("game", "Unknown"), entry))
+        else:  # old nested format fallback
+            for dev_name, dev_data in self.folder_db.get('developers', {}).items():
+                for game_name, game_data in dev_data.get("games", {}).items():
+                    appid_raw = game_data.get("appid")
+                    if appid_raw:
+                        appid_index.setdefault(str(appid_raw).strip(), []).append((dev_name, game_name, game_data))
+
+        self.matches = []
+        self.by_id = {}
+        for appid in appid_index.keys() & self.installed.keys():
+            for n, (dev_name, game_name, game_data) in enumerate(appid_index[appid]):
+                if entries:
+                    # Only installed games need their contents flattened into the "files" list
+                    contents = game_data.get("contents")
+                    game_data["files"] = flatten_game_contents(contents) if isinstance(contents, (dict, list)) else []
+                # Row key: the first entry keeps the bare appid, so by_id.get(appid) still finds it
+                key = appid if n == 0 else f"{appid}#{n}"
+                match_info = {
+                    "dev_name": dev_name,
+                    "game_name": game_name,
+                    "data": game_data,
+                    "appid": appid,
+                    "key": key
+                }
+                self.matches.append(match_info)
+                self.by_id[key] = match_info
+                logging.info("MATCH: %s -> %s by %s", appid, game_name, dev_name)
+
+        self.matches = sorted(self.matches, key=lambda x: x['game_name'].lower())
+        logging.info(f"FOUND {len(self.matches)} matched games with patches")
+
+    def _refresh_db_async(self):
+        """Background conditional fetch of the database; always posts a result so the status line resolves."""
+        try:
+            folder_db = download_database()
+        except Exception as e:
+            logging.error(f"Update failed: {e}")
+            self._ui_put(("db_refreshed", (None, "Update check failed")))
+            return
+        self._ui_put(("db_refreshed", (folder_db, "Up to date" if folder_db is None else "Updated")))
+
+    def apply_refreshed_db(self, folder_db, db_status):
+        """Swap in a refreshed database (if any) on the Tk thread and refresh the game list."""
+        if folder_db is None:
+            self.db_status = self.db_status.replace("Checking for updates...", db_status)
+        else:
+            self.load_database(folder_db, db_status)
+            self.build_matches()
+            self.last_applied = self.load_per_game_configs()
+            self.update_match_flags()
+            selected = self.tree.selection()
+            self.filter_games()
+            if selected and selected[0] in self.by_id:
+                self.on_select(None)
+        # Leave the status line alone while a patch is reporting progress in it
+        if self.progress_frame is None:
+            self.status.config(text=self.db_status)
 
     def load_per_game_configs(self):
         """Load last_applied from per-game patcher_config.json files."""
         last_applied = {}
         for appid, install_dir in self.installed.items():
             config_path = install_dir / CONFIG_FILENAME
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                    last_patch = config.get('last_patch', {})
-                    if last_patch:
-                        appid_str = str(appid)
-                        if appid_str not in last_applied:
-                            last_applied[appid_str] = {}
-                        # Look up game_name from by_id
-                        game_name = self.by_id.get(appid_str, {}).get('game_name', appid_str)  # Fallback to appid if no match
-                        last_applied[appid_str][game_name] = last_patch
-                        logging.debug(f"Loaded config for {appid}: {last_patch.get('file', 'N/A')}")
-                except Exception as e:
-                    logging.warning(f"Failed to load {config_path}: {e}")
+            # One read per game; a missing config is the common case, so no exists() probe first
+            try:
+                config = json_loads(config_path.read_bytes())
+                last_patch = config.get('last_patch', {})
+                if last_patch:
+                    appid_str = str(appid)
+                    if appid_str not in last_applied:
+                        last_applied[appid_str] = {}
+                    # Look up game_name from by_id
+                    game_name = self.by_id.get(appid_str, {}).get('game_name', appid_str)  # Fallback to appid if no match
+                    last_applied[appid_str][game_name] = last_patch
+                    logging.debug("Loaded config for %s: %s", appid, last_patch.get('file', 'N/A'))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Failed to load {config_path}: {e}")
         return last_applied
 
     def migrate_old_to_per_game(self, old_data):
@@ -1204,15 +1534,13 @@ class App(tk.Tk):
                     try:
                         # Load existing or create new
                         if config_path.exists():
-                            with open(config_path, 'r', encoding='utf-8') as f:
-                                config = json.load(f)
+                            config = json_loads(config_path.read_bytes())
                         else:
                             config = {}
                         
                         config['last_patch'] = patch_data
                         
-                        with open(config_path, 'w', encoding='utf-8') as f:
-                            json.dump(config, f, indent=4)
+                        config_path.write_bytes(json_dumps_pretty(config))
                     except Exception as e:
                         logging.warning(f"Failed to migrate {game_name}: {e}")
 
@@ -1227,15 +1555,15 @@ class App(tk.Tk):
         try:
             config = {}
             if config_path.exists():
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = json_loads(config_path.read_bytes())
             config['last_patch'] = {
                 'file': file_name,
                 'date': date,
-                'changes': changes  # {"overwritten": [...], "added": [...], "skipped": [...]}
+                'changes': changes  # {"overwritten": [...], "added": [...], "skipped": [...], "identical": [...]}
             }
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            tmp_path = config_path.with_suffix('.tmp')
+            tmp_path.write_bytes(json_dumps_pretty(config))
+            os.replace(tmp_path, config_path)
             # Update in-memory for immediate UI refresh
             if appid_str not in self.last_applied:
                 self.last_applied[appid_str] = {}
@@ -1244,11 +1572,71 @@ class App(tk.Tk):
         except Exception as e:
             logging.error(f"Failed to save {config_path}: {e}")
 
+    def load_cache_index(self):
+        """Load the cache verification index, starting fresh if it is missing or corrupt."""
+        index_path = self.cache_dir / CACHE_INDEX_FILENAME
+        try:
+            return json_loads(index_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"Failed to load cache index, rebuilding: {e}")
+            return {}
+
+    def tidy_cache(self):
+        """Drop leftover partial downloads and, once, migrate cache files from the old <name> keys."""
+        migrate = not (self.cache_dir / CACHE_ID_KEYED_MARKER).exists()
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.is_file()]
+        except OSError as e:
+            logging.warning(f"Failed to scan cache dir: {e}")
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.name.startswith(CACHE_PARTIAL_PREFIX):
+                remove_quietly(path)
+            elif migrate and not entry.name.startswith('.') and entry.name != CACHE_INDEX_FILENAME:
+                try:
+                    self.migrate_legacy_cache_file(path)
+                except OSError as e:
+                    logging.warning(f"Failed to migrate cache file {entry.name}: {e}")
+        if migrate:
+            try:
+                (self.cache_dir / CACHE_ID_KEYED_MARKER).touch()
+            except OSError as e:
+                logging.warning(f"Failed to mark cache as migrated: {e}")
+
+    def migrate_legacy_cache_file(self, path):
+        """Rename a <name>-keyed cache file to <id>_<name> if the index vouches for it, else delete it."""
+        size = path.stat().st_size
+        candidates = [fid for fid, entry in self.cache_index.items()
+                      if entry.get('size') == size and not (self.cache_dir / f"{fid}_{path.name}").exists()]
+        if candidates:
+            crc = quick_crc(path)
+            for fid in candidates:
+                if self.cache_index[fid].get('crc32') == crc:
+                    path.replace(self.cache_dir / f"{fid}_{path.name}")
+                    logging.info("Migrated cached %s to its Drive id key", path.name)
+                    return
+        # Without a verified id it could belong to any same-name patch, so it would never be reused
+        logging.info("Removing unkeyed legacy cache file %s", path.name)
+        remove_quietly(path)
+
+    def save_cache_index(self):
+        index_path = self.cache_dir / CACHE_INDEX_FILENAME
+        tmp_path = index_path.with_suffix('.tmp')
+        try:
+            tmp_path.write_bytes(json_dumps_bytes(self.cache_index))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logging.warning(f"Failed to save cache index: {e}")
+
     def clear_cache(self):
         if messagebox.askyesno("Clear Cache", "Delete all cached patches? (Frees space)"):
             try:
                 shutil.rmtree(self.cache_dir)
                 self.cache_dir.mkdir(exist_ok=True)
+                self.cache_index = {}
                 logging.info("Cache cleared")
                 messagebox.showinfo("Done", "Cache cleared!")
             except Exception as e:
@@ -1276,73 +1664,130 @@ class App(tk.Tk):
                 grouped["Miscellaneous"].append(str(item))
         return dict(grouped)
 
-    def process_ui_queue(self):
+    def _throttled_put(self, kind, key, payload, min_ms=50):
+        """Queue a UI update, dropping repeats and holding back anything within min_ms of the last one for key.
+
+        Call _flush_throttled when the burst ends, so a held-back final value (e.g. 100%) still shows.
+        """
+        now = time.monotonic()
+        slot = (kind, id(key))
+        last = self._ui_last_put.get(slot)
+        if last is not None:
+            last_ts, last_payload, _ = last
+            if payload == last_payload:
+                self._ui_last_put[slot] = (last_ts, last_payload, None)
+                return
+            if (now - last_ts) * 1000 < min_ms:
+                self._ui_last_put[slot] = (last_ts, last_payload, payload)
+                return
+        self._ui_last_put[slot] = (now, payload, None)
+        self._ui_put((kind, (key, payload)))
+
+    def _flush_throttled(self, kind, key):
+        """Send the update _throttled_put last held back for key, if any (the trailing edge)."""
+        slot = (kind, id(key))
+        last = self._ui_last_put.get(slot)
+        if last is not None and last[2] is not None:
+            self._ui_last_put[slot] = (time.monotonic(), last[2], None)
+            self._ui_put((kind, (key, last[2])))
+
+    def _ui_put(self, item):
+        """Queue a UI message and wake the Tk thread with a single <<UIQueue>> event."""
+        self.ui_queue.put(item)
+        if not self._ui_pending.is_set():
+            self._ui_pending.set()
+            try:
+                self.event_generate("<<UIQueue>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                # Window closed, or mainloop not running yet: the item stays queued for the next wakeup
+                self._ui_pending.clear()
+
+    def _fetch_put(self, file_id, item):
+        """_ui_put for download progress, dropped unless file_id is the fetch being waited on."""
+        if self._foreground_fetch == file_id:
+            self._ui_put(item)
+
+    def process_ui_queue(self, event=None):
+        # Clear first so a put racing with this drain schedules another one
+        self._ui_pending.clear()
+        # Only the newest value per widget is ever visible, so collapse runs of widget
+        # updates and apply each once; other messages flush them first to keep ordering
+        latest = {}
         try:
             while True:
                 msg, args = self.ui_queue.get_nowait()
-                if msg == "update_progress":
-                    progress_var, value = args
-                    if value == -1:
-                        if self.progress_bar_widget['mode'] != 'indeterminate':
-                            self.progress_bar_widget.configure(mode='indeterminate')
-                            self.progress_bar_widget.start(10)
-                    else:
-                        if self.progress_bar_widget['mode'] != 'determinate':
-                            self.progress_bar_widget.stop()
-                            self.progress_bar_widget.configure(mode='determinate')
-                        progress_var.set(value)
-                elif msg == "update_status":
-                    label, text = args
-                    label.config(text=text)
-                elif msg == "update_speed":
-                    label, text = args
-                    label.config(text=text)
-                elif msg == "reset_ui":
-                    self.reset_ui()
-                elif msg == "save_per_game_config":
-                    appid, game_name, file_name, date, changes = args
-                    self.save_per_game_config(appid, game_name, file_name, date, changes)
+                if msg in ("update_progress", "update_status", "update_speed"):
+                    slot = (msg, id(args[0]))
+                    latest.pop(slot, None)
+                    latest[slot] = (msg, args)
+                    continue
+                for pending in latest.values():
+                    self.handle_ui_message(*pending)
+                latest.clear()
+                self.handle_ui_message(msg, args)
         except queue.Empty:
             pass
-        self.after(50, self.process_ui_queue)
+        for pending in latest.values():
+            self.handle_ui_message(*pending)
+
+    def handle_ui_message(self, msg, args):
+        if msg == "update_progress":
+            progress_var, value = args
+            if value == -1:
+                if self.progress_bar_widget['mode'] != 'indeterminate':
+                    self.progress_bar_widget.configure(mode='indeterminate')
+                    self.progress_bar_widget.start(10)
+            else:
+                if self.progress_bar_widget['mode'] != 'determinate':
+                    self.progress_bar_widget.stop()
+                    self.progress_bar_widget.configure(mode='determinate')
+                progress_var.set(value)
+        elif msg == "update_status":
+            label, text = args
+            label.config(text=text)
+        elif msg == "update_speed":
+            label, text = args
+            label.config(text=text)
+        elif msg == "reset_ui":
+            self.reset_ui()
+        elif msg == "db_refreshed":
+            self.apply_refreshed_db(*args)
+        elif msg == "save_per_game_config":
+            appid, game_name, file_name, date, changes = args
+            self.save_per_game_config(appid, game_name, file_name, date, changes)
        
     def refresh_after_patch(self):
         # Refresh treeview + re-select current game so ★ disappears instantly
-        current_appid = self.current_appid
-        self.last_applied = self.load_per_game_configs()  # Reload from files
+        current_key = self.current_key
+        # save_per_game_config already put the new last_patch into self.last_applied,
+        # so there is no need to re-read every installed game's config from disk
+        self.update_match_flags()
         self.filter_games() # Rebuilds list with new last_applied data
         # Re-select the game that was just patched
         for item in self.tree.get_children():
-            if self.tree.item(item)["tags"][0] == str(current_appid):
+            if str(self.tree.item(item)["tags"][0]) == current_key:
                 self.tree.selection_set(item)
                 self.tree.focus(item)
                 self.on_select(None)
                 break
 
     def parse_size_bytes(self, size_str):
-        import re
         if not size_str or str(size_str).strip().lower() == 'unknown':
             return None
         s = str(size_str).strip().replace(',', '')
-        match = re.search(r"([\d\.]+)\s*([KMGTP]?B)", s, re.IGNORECASE)
+        match = _SIZE_RE.search(s)
         if match:
             value = float(match.group(1))
             unit = match.group(2).upper()
-            multipliers = {
-                'B': 1,
-                'KB': 1024,
-                'MB': 1024 * 1024,
-                'GB': 1024 * 1024 * 1024,
-                'TB': 1024 * 1024 * 1024 * 1024
-            }
-            return int(value * multipliers.get(unit, 1))
+            return int(value * _SIZE_UNITS.get(unit, 1))
         if s.isdigit():
             return int(s)
         return None
 
-    def download_with_gdown(self, file_id, output_path, expected_bytes, progress_var, status_label, speed_label):
+    def download_with_gdown(self, file_id, output_path, expected_bytes, progress_var, status_label, speed_label, display_name=None):
         output_path = Path(output_path)
-        self.ui_queue.put(("update_status", (status_label, f"Downloading: {output_path.name}")))
+        display_name = display_name or output_path.name
+        self._fetch_put(file_id, ("update_status", (status_label, f"Downloading: {display_name}")))
         start_time = time.time()
         initial_size = output_path.stat().st_size if output_path.exists() else 0
         last_size = initial_size
@@ -1351,30 +1796,53 @@ class App(tk.Tk):
         posix_path = output_path.as_posix()
      
         thread_error = []
+        # Ranged downloads preallocate the file, so progress comes from this counter instead of its size
+        ranged = {"active": False, "bytes": 0, "lock": threading.Lock()}
         def run_gdown():
             try:
+                # Partial files are left to gdown so its resume support still applies
+                if not output_path.exists():
+                    try:
+                        if self.download_ranged(file_id, output_path, ranged):
+                            return
+                    except Exception as e:
+                        if self._patch_abort.is_set():
+                            raise
+                        logging.warning(f"Ranged download failed, falling back to gdown: {e}")
+                        ranged["active"] = False
+                        if output_path.exists():
+                            output_path.unlink()
+                        ranged["fell_back"] = True
+                ensure_module("gdown")
                 import gdown
                 gdown.download(id=file_id, output=posix_path, quiet=True, resume=True)
             except Exception as e:
                 thread_error.append(e)
         download_thread = threading.Thread(target=run_gdown, daemon=True)
         download_thread.start()
-        logging.debug(f"Started gdown thread for {output_path.name}")
+        logging.debug("Started gdown thread for %s", output_path.name)
         while download_thread.is_alive():
-            if output_path.exists():
-                current_size = output_path.stat().st_size
+            if self._patch_abort.is_set():
+                # gdown cannot be interrupted; leave its daemon thread behind, the partial file is re-verified later
+                raise RuntimeError("Download aborted")
+            if ranged.pop("fell_back", False):
+                # gdown starts over from an empty file; measure its progress and speed afresh
+                last_size = initial_size = 0
+                start_time = time.time()
+            if ranged["active"] or output_path.exists():
+                current_size = ranged["bytes"] if ranged["active"] else output_path.stat().st_size
                 if current_size > last_size:
                     last_size = current_size
                     no_growth_count = 0
                     if expected_bytes and expected_bytes > 0:
                         percent = min(100, (current_size / expected_bytes) * 100)
-                        self.ui_queue.put(("update_progress", (progress_var, percent)))
+                        self._fetch_put(file_id, ("update_progress", (progress_var, percent)))
                     else:
-                        self.ui_queue.put(("update_progress", (progress_var, -1)))
+                        self._fetch_put(file_id, ("update_progress", (progress_var, -1)))
                     elapsed = time.time() - start_time
                     if elapsed > 0.5:
                         speed_mb = (current_size - initial_size) / elapsed / (1024 * 1024)
-                        self.ui_queue.put(("update_speed", (speed_label, f"{speed_mb:.2f} MB/s")))
+                        self._fetch_put(file_id, ("update_speed", (speed_label, f"{speed_mb:.2f} MB/s")))
                 else:
                     no_growth_count += 1
             time.sleep(0.2)
@@ -1383,49 +1851,137 @@ class App(tk.Tk):
             raise RuntimeError(f"Download failed: {thread_error[0]}")
         actual_size = output_path.stat().st_size if output_path.exists() else 0
         if actual_size > initial_size:
-            self.ui_queue.put(("update_progress", (progress_var, 100)))
-            self.ui_queue.put(("update_speed", (speed_label, "Download complete")))
-            self.ui_queue.put(("update_status", (status_label, f"Download Complete: {output_path.name}")))
+            self._fetch_put(file_id, ("update_progress", (progress_var, 100)))
+            self._fetch_put(file_id, ("update_speed", (speed_label, "Download complete")))
+            self._fetch_put(file_id, ("update_status", (status_label, f"Download Complete: {display_name}")))
             logging.info(f"Download completed: {actual_size} bytes")
         return actual_size
 
+    def http_session(self):
+        """One keep-alive session for all downloads, so ranges and retries reuse TLS connections."""
+        with self._http_lock:
+            if self._http is None:
+                ensure_module("requests")
+                import requests
+                self._http = requests.Session()
+                # Room for every range of every concurrent patch download
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=RANGED_WORKERS * PATCH_DOWNLOAD_WORKERS)
+                self._http.mount("https://", adapter)
+            return self._http
+
+    def download_ranged(self, file_id, output_path, ranged, workers=RANGED_WORKERS):
+        """Download a Drive file with parallel HTTP range requests into a preallocated file.
+
+        Returns False (without touching output_path) if the server won't serve byte ranges.
+        """
+        http = self.http_session()
+        params = {'id': file_id, 'export': 'download', 'confirm': 't'}
+        head = http.head(GDRIVE_DOWNLOAD_URL, params=params, allow_redirects=True, timeout=15)
+        total = int(head.headers.get('Content-Length') or 0)
+        if (head.status_code != 200 or head.headers.get('Accept-Ranges') != 'bytes'
+                or 'text/html' in head.headers.get('Content-Type', '') or total < RANGED_MIN_BYTES):
+            return False
+        url = head.url  # Reuse the resolved redirect target for every range
+        # Flip to the byte counter first: a poll between the two would read the preallocated size
+        ranged["active"] = True
+        with open(output_path, 'wb') as f:
+            f.truncate(total)
+        step = -(-total // workers)
+        spans = [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+
+        def _fetch(span):
+            start, end = span
+            for attempt in range(RANGED_RETRIES + 1):
+                with http.get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True, timeout=30) as r:
+                    if r.status_code in (429, 503) and attempt < RANGED_RETRIES:
+                        # Throttled: wait as long as the server asks instead of guessing
+                        delay = retry_after_seconds(r.headers.get('Retry-After'), 2 ** attempt)
+                        logging.info(f"Range {start}-{end} throttled (HTTP {r.status_code}), retrying in {delay:.0f}s")
+                        time.sleep(delay)
+                        continue
+                    if r.status_code != 206:
+                        raise RuntimeError(f"Range request returned HTTP {r.status_code}")
+                    # Disjoint ranges, so each worker can write through its own handle
+                    with open(output_path, 'r+b') as f:
+                        f.seek(start)
+                        for block in r.iter_content(1 << 20):
+                            if self._patch_abort.is_set():
+                                raise RuntimeError("Download aborted")
+                            f.write(block)
+                            with ranged["lock"]:
+                                ranged["bytes"] += len(block)
+                    return
+
+        with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+            list(pool.map(_fetch, spans))
+        if ranged["bytes"] != total:
+            raise RuntimeError(f"Ranged download incomplete: {ranged['bytes']} of {total} bytes")
+        logging.info(f"Ranged download finished with {len(spans)} connections: {output_path.name}")
+        return True
+
     def extract_with_7z(self, archive_path, extract_dir, progress_var=None):
-        script_dir = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).parent
-        local_7z = script_dir / '7z.exe'
-        if not local_7z.exists():
+        if not self._has_7z:
             raise FileNotFoundError("7z.exe not found.")
         if not extract_dir.is_dir():
             extract_dir.mkdir(parents=True, exist_ok=True)
         if extract_dir.suffix == '.exe':
             extract_dir = extract_dir.with_suffix('')
             extract_dir.mkdir(exist_ok=True)
-        cmd = [str(local_7z), 'x', str(archive_path), f'-o{extract_dir}', '-y', '-bsp1']
-        no_window_flag = 0x08000000 if sys.platform == 'win32' else 0
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            creationflags=no_window_flag
-        )
-        while True:
-            chunk = process.stdout.read(64)
-            if not chunk and process.poll() is not None:
-                break
-            if chunk:
-                try:
-                    text = chunk.decode('utf-8', errors='ignore')
-                    matches = re.findall(r'\b(\d+)%', text)
-                    if matches and progress_var:
-                        percent = int(matches[-1])
-                        self.ui_queue.put(("update_progress", (progress_var, percent)))
-                except:
-                    pass
-        if process.returncode != 0:
-            raise subprocess.CalledProcessError(process.returncode, cmd)
+        # -bso0 drops 7z's file listing so stdout carries only the progress we parse (and
+        # nothing at all without a progress bar); -mmt=on lets LZMA2 decode on all cores
+        cmd = [str(self._local_7z), 'x', str(archive_path), f'-o{extract_dir}', '-y', '-bso0', '-mmt=on',
+               '-bsp1' if progress_var else '-bsp0']
+        # stderr goes to a temp file: never a second pipe to drain, yet still there on failure
+        with tempfile.TemporaryFile() as err:
+            if progress_var:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, creationflags=self._no_window_flag)
+                while True:
+                    chunk = process.stdout.read(64)
+                    if not chunk and process.poll() is not None:
+                        break
+                    if chunk:
+                        percent = last_percent(chunk)
+                        if percent is not None:
+                            self._throttled_put("update_progress", progress_var, percent)
+                self._flush_throttled("update_progress", progress_var)
+                returncode = process.returncode
+            else:
+                returncode = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=err, creationflags=self._no_window_flag).returncode
+            if returncode != 0:
+                err.seek(0)
+                logging.error(f"7z extraction failed for {archive_path}: {err.read().decode(errors='replace').strip()}")
+                raise subprocess.CalledProcessError(returncode, cmd)
         logging.info(f"Extracted with 7z: {archive_path}")
 
+    def extract_zip_parallel(self, zf, extract_dir):
+        """Extract ZIP members across a thread pool (zlib releases the GIL while inflating).
+
+        Members go through zf.extract, which sanitizes names exactly like extractall did
+        (leading '/', drive letters, '..' parts, Windows-illegal characters).
+        """
+        root = str(extract_dir)
+        seen_dirs = set()
+        jobs = []
+        # Sequential pass: directory entries plus the first file of each directory, so
+        # zf.extract's unguarded makedirs never races between workers
+        for info in zf.infolist():
+            parent = info.filename.rstrip('/').rpartition('/')[0]
+            if info.is_dir() or parent not in seen_dirs:
+                seen_dirs.add(parent)
+                zf.extract(info, root)
+            else:
+                jobs.append(info)
+
+        # A single deflate stream can't be split, so only fan out for multi-file archives
+        if len(jobs) <= 1:
+            for info in jobs:
+                zf.extract(info, root)
+            return
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+            list(pool.map(lambda info: zf.extract(info, root), jobs))
+
     def extract_archive(self, archive_path, extract_dir, progress_var=None):
-        logging.debug(f"DEBUG: Archive path: {archive_path}")
+        logging.debug("Archive path: %s", archive_path)
         if not extract_dir.is_dir():
             extract_dir.mkdir(parents=True, exist_ok=True)
         if extract_dir.suffix == '.exe':
@@ -1435,9 +1991,9 @@ class App(tk.Tk):
         try:
             if ext == '.zip':
                 if progress_var:
-                    self.ui_queue.put(("update_progress", (progress_var, -1)))
+                    self._ui_put(("update_progress", (progress_var, -1)))
                 with zipfile.ZipFile(archive_path, 'r') as zf:
-                    zf.extractall(extract_dir)
+                    self.extract_zip_parallel(zf, extract_dir)
                     logging.info(f"Extracted ZIP: {len(zf.namelist())} files")
             else:
                 self.extract_with_7z(archive_path, extract_dir, progress_var)
@@ -1448,157 +2004,281 @@ class App(tk.Tk):
             raise
 
     def smart_apply_patch(self, extract_dir, install_dir, status_label):
-        game_files = defaultdict(list)
-        for root, dirs, files in os.walk(install_dir):
+        # Enumerate the (small) patch first so the game index only keeps names it can match
+        patch_files = []
+        for root, _, files in os.walk(extract_dir):
             for file in files:
-                game_files[file.lower()].append(os.path.join(root, file))
+                patch_files.append((file, os.path.join(root, file)))
+        game_files = index_game_files(install_dir, {fold_name(file) for file, _ in patch_files})
         overwritten_files = []
         added_files = []
         skipped_files = []
-        overwritten = 0
-        added = 0
+        identical_files = []
         skipped = 0
-        for root, _, files in os.walk(extract_dir):
-            for file in files:
-                src = os.path.join(root, file)
-                relative = Path(src).relative_to(extract_dir)
-                default_dst = install_dir / relative
-                matches = game_files.get(file.lower(), [])
-                if matches:
-                    if len(matches) == 1:
-                        dst = matches[0]
-                        shutil.copy2(src, dst)
-                        overwritten_files.append(str(relative))  # Track relative path
-                        overwritten += 1
-                        self.ui_queue.put(("update_status", (status_label, f"OVERWRITTEN: {file}")))
-                    else:
-                        skipped_files.append(str(relative))
-                        skipped += 1
-                        logging.warning(f"MULTIPLE MATCHES for {file}: {matches} - Skipping")
-                        self.ui_queue.put(("update_status", (status_label, f"SKIPPED (multi-match): {file}")))
+        # Plan every copy first; dst -> (src, label, relative, kind) so if two patch files
+        # land on the same game file the later one wins, exactly as the old sequential loop did
+        copies = {}
+        new_dirs = set()
+        results = {"overwritten": overwritten_files, "added": added_files}
+
+        def plan(dst, src, label, relative, kind):
+            superseded = copies.get(dst)
+            if superseded is not None:
+                # The old loop wrote it and then overwrote it again; still record it
+                results[superseded[3]].append(superseded[2])
+            copies[dst] = (src, label, relative, kind)
+
+        for file, src in patch_files:
+            relative = Path(src).relative_to(extract_dir)
+            default_dst = install_dir / relative
+            matches = game_files.get(fold_name(file), [])
+            if matches:
+                if len(matches) == 1:
+                    plan(matches[0], src, f"OVERWRITTEN: {file}", str(relative), "overwritten")
                 else:
-                    default_dst.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src, default_dst)
-                    added_files.append(str(relative))
-                    added += 1
-                    self.ui_queue.put(("update_status", (status_label, f"ADDED: {file}")))
+                    skipped_files.append(str(relative))
+                    skipped += 1
+                    logging.warning("MULTIPLE MATCHES for %s: %s - Skipping", file, matches)
+                    self._throttled_put("update_status", status_label, f"SKIPPED (multi-match): {file}")
+            else:
+                new_dirs.add(default_dst.parent)
+                plan(str(default_dst), src, f"ADDED: {file}", str(relative), "added")
+        # Create each target directory once, shallowest first, so parents=True never has to climb
+        for directory in sorted(new_dirs, key=lambda d: len(d.parts)):
+            directory.mkdir(parents=True, exist_ok=True)
+        # Each copy blocks in the kernel, so a pool overlaps them up to the disk's queue depth
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            futures = {pool.submit(copy_if_changed, src, dst): dst for dst, (src, *_) in copies.items()}
+            written = {}
+            for future in as_completed(futures):
+                dst = futures[future]
+                written[dst] = future.result()
+                self._throttled_put("update_status", status_label, copies[dst][1])
+        self._flush_throttled("update_status", status_label)
+        # Record in patch order; files already identical to the patch were not written, so they are not overwrites
+        for dst, (_, _, relative, kind) in copies.items():
+            if written[dst]:
+                results[kind].append(relative)
+            else:
+                identical_files.append(relative)
         changes = {
             "overwritten": overwritten_files,
             "added": added_files,
-            "skipped": skipped_files if skipped_files else None  # Optional
+            "skipped": skipped_files if skipped_files else None,  # Optional
+            "identical": identical_files if identical_files else None  # Optional
         }
-        return overwritten, added, skipped, changes
+        return len(overwritten_files), len(added_files), skipped, len(identical_files), changes
+
+    def test_archive(self, archive_path):
+        """CRC-check an archive in-process when possible, otherwise via `7z t`."""
+        ext = archive_path.suffix.lower()
+        try:
+            if ext == '.zip':
+                with zipfile.ZipFile(archive_path, 'r') as zf:
+                    return zf.testzip() is None
+            if ext == '.7z':
+                # Optional extra, imported on first use so it never weighs on cold start
+                import py7zr
+                with py7zr.SevenZipFile(archive_path, 'r') as z:
+                    return z.testzip() is None
+        except ImportError:
+            pass  # No py7zr: 7z.exe below does the check
+        except Exception as e:
+            logging.debug(f"In-process test failed for {archive_path.name}, falling back to 7z: {e}")
+        test_cmd = [str(self._local_7z), 't', str(archive_path)]
+        test_result = subprocess.run(test_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=self._no_window_flag)
+        if test_result.returncode == 0:
+            return True
+        # Only pay for capturing/decoding 7z's output when there is a failure to explain
+        failed = subprocess.run(test_cmd, capture_output=True, text=True, errors='replace', creationflags=self._no_window_flag)
+        logging.warning(f"7z test failed for {archive_path.name}: {(failed.stderr or failed.stdout).strip()}")
+        return False
+
+    def record_verified(self, file_id, cache_file, crc=None):
+        """Record a verified cache file in the index and flush it to disk."""
+        try:
+            st = cache_file.stat()
+            entry = {
+                'size': st.st_size,
+                'crc32': crc if crc is not None else quick_crc(cache_file),
+                'mtime': st.st_mtime,
+                'verified_at': time.time()
+            }
+        except OSError as e:
+            logging.warning("Failed to index cache file %s: %s", cache_file.name, e)
+            return
+        with self._cache_index_lock:
+            self.cache_index[file_id] = entry
+            self.save_cache_index()
+
+    def verify_cached(self, file_id, cache_file):
+        """Verify a cached file, trusting the index before falling back to a full archive test."""
+        entry = self.cache_index.get(file_id)
+        try:
+            st = cache_file.stat()
+            if entry and entry.get('size') == st.st_size:
+                if entry.get('mtime') == st.st_mtime and time.time() - entry.get('verified_at', 0) < CACHE_VERIFY_MAX_AGE:
+                    logging.debug("Cache index hit: %s", cache_file.name)
+                    return True
+                # Stale or touched: a CRC over the mapped file is still far cheaper than `7z t`
+                crc = quick_crc(cache_file)
+                if entry.get('crc32') == crc:
+                    self.record_verified(file_id, cache_file, crc)
+                    return True
+        except OSError:
+            pass
+        if not self.test_archive(cache_file):
+            with self._cache_index_lock:
+                if self.cache_index.pop(file_id, None) is not None:
+                    self.save_cache_index()
+            return False
+        self.record_verified(file_id, cache_file)
+        return True
+
+    def fetch_patch_file(self, f, progress_var, status_label, speed_label):
+        """Return a verified local copy of a patch file, from cache or freshly downloaded."""
+        file_id = f['id']
+        file_name = f['name']
+        file_path = f.get('path', file_name)
+        raw_size = f.get('size', 'Unknown')
+        # The indexer's exact byte count beats re-parsing the rounded display string
+        expected_bytes = f.get('raw_size')
+        if not isinstance(expected_bytes, int):
+            expected_bytes = self.parse_size_bytes(raw_size)
+        # Keyed by Drive id: different patches share names, and up to three fetches run at once
+        cache_file = self.cache_dir / f"{file_id}_{file_name}"
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        use_cache = False
+        if cache_file.exists():
+            actual_size = os.path.getsize(cache_file)
+            small_file_check = expected_bytes and expected_bytes < 2048 and actual_size > 0
+            tolerance_check = expected_bytes is None or (abs(actual_size - expected_bytes) <= expected_bytes * 0.05)
+            if not self.verify_cached(file_id, cache_file):
+                logging.warning(f"Cached file failed integrity. Deleting.")
+                cache_file.unlink()
+            elif tolerance_check or small_file_check:
+                use_cache = True
+                logging.info("Using cached: %s", file_name)
+        if not use_cache:
+            retries = 0
+            max_retries = 3
+            while retries < max_retries:
+                logging.info("Downloading %s (attempt %d)", file_path, retries + 1)
+                self._fetch_put(file_id, ("update_status", (status_label, f"Downloading: {file_path}")))
+                self._fetch_put(file_id, ("update_progress", (progress_var, -1)))
+                # A fresh name per attempt (same suffix, for test_archive): a gdown thread orphaned
+                # by an abort may still be writing an earlier one, so only a verified file becomes cache_file
+                output = cache_file.with_name(f"{CACHE_PARTIAL_PREFIX}{uuid.uuid4().hex[:8]}-{cache_file.name}")
+                try:
+                    self.download_with_gdown(file_id, output, expected_bytes or 0, progress_var, status_label, speed_label,
+                                             display_name=file_name)
+                    actual_size = os.path.getsize(output)
+                except Exception:
+                    remove_quietly(output)
+                    raise
+                small_file_check = expected_bytes and expected_bytes < 2048 and actual_size > 0
+                tolerance_check = expected_bytes is None or (abs(actual_size - expected_bytes) <= expected_bytes * 0.05)
+                if tolerance_check or small_file_check:
+                    # Skip 7-Zip integrity test for .exe files (they are usually Inno/NSIS installers, not 7z archives)
+                    if output.suffix.lower() != ".exe":
+                        if not self.test_archive(output):
+                            # Only treat as failed if it was a real archive
+                            retries += 1
+                            remove_quietly(output)
+                            continue
+                    # For .exe or valid archive → accept it
+                    os.replace(output, cache_file)
+                    self.record_verified(file_id, cache_file)
+                    break
+                retries += 1
+                remove_quietly(output)
+            else:
+                raise ValueError(f"Download failed after {max_retries} attempts.")
+        return cache_file
+
+    def apply_patch_file(self, f, output, install_dir, progress_var, status_label):
+        """Extract a downloaded patch file and merge it into install_dir."""
+        file_path = f.get('path', f['name'])
+        self._ui_put(("update_status", (status_label, f"Extracting: {file_path}")))
+        temp_extract_dir = Path(tempfile.mkdtemp())
+        try:
+            if output.suffix.lower() == ".exe":
+                for flags in ['/VERYSILENT /SUPPRESSMSGBOXES /NORESTART', '/S', '']:
+                    cmd = [str(output)] + flags.split()
+                    result = subprocess.run(cmd, cwd=str(temp_extract_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=self._no_window_flag)
+                    if result.returncode == 0:
+                        break
+                else:
+                    raise RuntimeError("Self-extracting EXE failed")
+            else:
+                self.extract_archive(output, temp_extract_dir, progress_var)
+        finally:
+            pass
+        self._ui_put(("update_status", (status_label, f"Applying: {file_path}")))
+        overwritten, added, skipped, identical, changes = self.smart_apply_patch(temp_extract_dir, install_dir, status_label)
+        logging.info(f"Applied: {overwritten} overwritten, {added} added, {skipped} skipped, {identical} already identical")
+        shutil.rmtree(temp_extract_dir, ignore_errors=True)
+        return changes
 
     def process_patch(self, files, selected_indices, install_dir, game_name, progress_var, status_label, speed_label, appid):
         today_date = time.strftime("%Y-%m-%d")
         applied_file_name = None
         total_changes = None
         try:
-            script_dir = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).parent
-            local_7z = script_dir / '7z.exe'
-            if not local_7z.exists():
+            if not self._has_7z:
                 raise FileNotFoundError("7z.exe not found.")
-            no_window_flag = 0x08000000 if sys.platform == 'win32' else 0
-            for idx in selected_indices:
-                f = files[idx]
-                file_id = f['id']
-                file_name = f['name']
-                file_path = f.get('path', file_name)
-                raw_size = f.get('size', 'Unknown')
-                expected_bytes = self.parse_size_bytes(raw_size)
-                if file_name.lower().endswith(('.txt', '.docx', '.pdf')):
-                    self.ui_queue.put(("update_status", (status_label, f"Instructions viewed: {file_name}")))
-                    continue
-                cache_file = self.cache_dir / file_name
-                cache_file.parent.mkdir(parents=True, exist_ok=True)
-                use_cache = False
-                if cache_file.exists():
-                    actual_size = os.path.getsize(cache_file)
-                    small_file_check = expected_bytes and expected_bytes < 2048 and actual_size > 0
-                    tolerance_check = expected_bytes is None or (abs(actual_size - expected_bytes) <= expected_bytes * 0.05)
-                    test_cmd = [str(local_7z), 't', str(cache_file)]
-                    test_result = subprocess.run(test_cmd, capture_output=True, text=True, creationflags=no_window_flag)
-                    if test_result.returncode != 0:
-                        logging.warning(f"Cached file failed integrity. Deleting.")
-                        cache_file.unlink()
-                    elif tolerance_check or small_file_check:
-                        use_cache = True
-                        logging.info(f"Using cached: {file_name}")
-                output = cache_file
-                if not use_cache:
-                    retries = 0
-                    max_retries = 3
-                    while retries < max_retries:
-                        logging.info(f"Downloading {file_path} (attempt {retries+1})")
-                        self.ui_queue.put(("update_status", (status_label, f"Downloading: {file_path}")))
-                        self.ui_queue.put(("update_progress", (progress_var, -1)))
-                        self.download_with_gdown(file_id, output, expected_bytes or 0, progress_var, status_label, speed_label)
-                        actual_size = os.path.getsize(output)
-                        small_file_check = expected_bytes and expected_bytes < 2048 and actual_size > 0
-                        tolerance_check = expected_bytes is None or (abs(actual_size - expected_bytes) <= expected_bytes * 0.05)
-                        if tolerance_check or small_file_check:
-                            # Skip 7-Zip integrity test for .exe files (they are usually Inno/NSIS installers, not 7z archives)
-                            if output.suffix.lower() != ".exe":
-                                test_cmd = [str(local_7z), 't', str(output)]
-                                test_result = subprocess.run(test_cmd, capture_output=True, text=True, creationflags=no_window_flag)
-                                if test_result.returncode != 0:
-                                    # Only treat as failed if it was a real archive
-                                    retries += 1
-                                    if output.exists():
-                                        output.unlink()
-                                    continue
-                            # For .exe or valid archive → accept it
-                            break
-                        retries += 1
-                        if output.exists():
-                            output.unlink()
-                    else:
-                        raise ValueError(f"Download failed after {max_retries} attempts.")
-                self.ui_queue.put(("update_status", (status_label, f"Extracting: {file_path}")))
-                temp_extract_dir = Path(tempfile.mkdtemp())
-                try:
-                    if output.suffix.lower() == ".exe":
-                        for flags in ['/VERYSILENT /SUPPRESSMSGBOXES /NORESTART', '/S', '']:
-                            cmd = [str(output)] + flags.split()
-                            result = subprocess.run(cmd, cwd=str(temp_extract_dir), capture_output=True, text=True, creationflags=no_window_flag)
-                            if result.returncode == 0:
-                                break
-                        else:
-                            raise RuntimeError("Self-extracting EXE failed")
-                    else:
-                        self.extract_archive(output, temp_extract_dir, progress_var)
-                finally:
-                    pass
-                self.ui_queue.put(("update_status", (status_label, f"Applying: {file_path}")))
-                overwritten, added, skipped, changes = self.smart_apply_patch(temp_extract_dir, install_dir, status_label)
-                total_changes = changes  # Accumulate if multi-file, but for now per-file
-                logging.info(f"Applied: {overwritten} overwritten, {added} added, {skipped} skipped")
-                shutil.rmtree(temp_extract_dir, ignore_errors=True)
-                if not file_name.lower().endswith(('.txt', '.docx', '.pdf')):
-                    applied_file_name = file_name
-            self.ui_queue.put(("update_status", (status_label, "SUCCESS")))
+            # Instruction documents never go through download/extract; report them once up front
+            doc_exts = ('.txt', '.docx', '.pdf')
+            doc_names = [files[i]['name'] for i in selected_indices if files[i]['name'].lower().endswith(doc_exts)]
+            patch_indices = [i for i in selected_indices if not files[i]['name'].lower().endswith(doc_exts)]
+            if doc_names:
+                self._ui_put(("update_status", (status_label, f"Instructions viewed: {', '.join(doc_names)}")))
+            # Download up to PATCH_DOWNLOAD_WORKERS files at once while earlier ones are
+            # extracted/applied; applying stays sequential and in selection order
+            self._patch_abort.clear()
+            pool = ThreadPoolExecutor(max_workers=PATCH_DOWNLOAD_WORKERS)
+            try:
+                pending = [(idx, pool.submit(self.fetch_patch_file, files[idx], progress_var, status_label, speed_label))
+                           for idx in patch_indices]
+                for idx, future in pending:
+                    # Hand the progress widgets to the download we are now waiting on
+                    self._foreground_fetch = files[idx]['id']
+                    if not future.done():
+                        self._ui_put(("update_status", (status_label, f"Downloading: {files[idx].get('path', files[idx]['name'])}")))
+                    output = future.result()
+                    self._foreground_fetch = None
+                    total_changes = self.apply_patch_file(files[idx], output, install_dir, progress_var, status_label)
+                    applied_file_name = files[idx]['name']
+            except Exception:
+                # Running fetches poll this flag; queued ones are cancelled by the shutdown below
+                self._patch_abort.set()
+                raise
+            finally:
+                self._foreground_fetch = None
+                pool.shutdown(cancel_futures=True)
+            self._ui_put(("update_status", (status_label, "SUCCESS")))
             if applied_file_name:
-                self.ui_queue.put(("save_per_game_config", (appid, game_name, applied_file_name, today_date, total_changes or {})))
+                self._ui_put(("save_per_game_config", (appid, game_name, applied_file_name, today_date, total_changes or {})))
             self.after(100, lambda: messagebox.showinfo("SUCCESS", f"Patched:\n{game_name}\n\nApplied: {applied_file_name or 'files'}\nSaved config with changes."))
             self.after(600, self.refresh_after_patch)
         except Exception as e:
             error_msg = str(e)
-            self.ui_queue.put(("update_status", (status_label, "FAILED")))
+            self._ui_put(("update_status", (status_label, "FAILED")))
             logging.error(f"PATCH FAILED: {error_msg}")
             self.after(100, lambda: messagebox.showerror("PATCH FAILED", error_msg))
         finally:
-            self.ui_queue.put(("reset_ui", None))
+            self._ui_put(("reset_ui", None))
 
     def patch(self):
         selected = self.tree.selection()
         if not selected:
             return
         tags = self.tree.item(selected[0])["tags"]
-        appid = str(tags[0])
-        match = self.by_id.get(appid)
+        match = self.by_id.get(str(tags[0]))
         if not match:
             messagebox.showerror("ERROR", "No patch data found.")
             return
+        appid = match["appid"]
         game_name = match["game_name"]
         install_dir = self.installed.get(appid)
         if not install_dir or not install_dir.exists():
@@ -1700,7 +2380,8 @@ class App(tk.Tk):
         self.search_var = tk.StringVar()
         self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=get_app_font(10))
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        self.search_entry.bind('<KeyRelease>', self.filter_games)
+        self._search_job = None
+        self.search_entry.bind('<KeyRelease>', self.schedule_filter)
         self.tree = ttk.Treeview(right_frame, columns=("Game",), show="headings", selectmode="browse")
         self.tree.heading("Game", text="Game")
         self.tree.column("Game", width=400, anchor="w")
@@ -1708,42 +2389,9 @@ class App(tk.Tk):
         style = ttk.Style()
         style.configure("Treeview", font=get_app_font(10))
         style.configure("Treeview.Heading", font=get_app_font(10, "bold"))
-        # UPDATE PRIORITY + ★ MARKER
-        games_with_update = []
-        games_without_update = []
-        for match in self.matches:
-            appid_str = str(match["data"]["appid"])
-            game_name = match["game_name"]
-            local_data = self.last_applied.get(appid_str, {}).get(game_name, {})
-            local_file = local_data.get("file")
-            update_available = False
-            if local_file:
-                file_still_exists = any(local_file == f["name"] for f in match["data"]["files"])
-                update_available = not file_still_exists
-            if update_available:
-                games_with_update.append(match)
-            else:
-                games_without_update.append(match)
-        games_with_update = sorted(games_with_update, key=lambda m: m["game_name"].lower())
-        games_without_update = sorted(games_without_update, key=lambda m: m["game_name"].lower())
-        display_matches = games_with_update + games_without_update
-        for match in display_matches:
-            appid = str(match["data"]["appid"])
-            game_name = match["game_name"]
-            local_data = self.last_applied.get(appid, {}).get(game_name, {})
-            local_file = local_data.get("file")
-            update_available = False
-            if local_file:
-                file_still_exists = any(local_file == f["name"] for f in match["data"]["files"])
-                update_available = not file_still_exists
-            if update_available:
-                display_name = f"★ {game_name}"
-                tags = (appid, "update")
-            else:
-                display_name = game_name
-                tags = (appid,)
-            self.tree.insert("", "end", values=(display_name,), tags=tags)
-        self.tree.tag_configure("update", foreground="#e67e22", font=get_app_font(11, "bold"))
+        # UPDATE PRIORITY + ★ MARKER (same ordering as a search with an empty term)
+        self._tree_rows = {}  # match key -> (values, tags) of its persistent tree item
+        self.filter_games()
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
         bottom_frame = tk.Frame(self, bg="#1e1e1e")
         bottom_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=(8, 0))
@@ -1751,50 +2399,102 @@ class App(tk.Tk):
                                font=get_app_font(10), bg="#1e1e1e", fg="#00ff88", padx=12)
         self.status.pack(fill=tk.X, side=tk.LEFT, expand=True)
 
+    def schedule_filter(self, event=None):
+        """Debounce search typing so only the last keystroke within 120 ms rebuilds the list."""
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(120, self.filter_games)
+
     def filter_games(self, event=None):
+        self._search_job = None
         search_term = self.search_var.get().lower().strip()
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        filtered = [m for m in self.matches if search_term in m['game_name'].lower()]
-        games_with_update = []
-        games_without_update = []
-        for match in filtered:
-            appid_str = str(match["data"]["appid"])
-            game_name = match["game_name"]
-            local_data = self.last_applied.get(appid_str, {}).get(game_name, {})
-            local_file = local_data.get("file")
-            update_available = False
-            if local_file:
-                file_still_exists = any(local_file == f["name"] for f in match["data"]["files"])
-                update_available = not file_still_exists
-            if update_available:
-                games_with_update.append(match)
-            else:
-                games_without_update.append(match)
-        games_with_update = sorted(games_with_update, key=lambda m: m["game_name"].lower())
-        games_without_update = sorted(games_without_update, key=lambda m: m["game_name"].lower())
-        display_matches = games_with_update + games_without_update
+        filtered = [m for m in self.matches if search_term in m['_name_lower']]
+        # Updates first, then alphabetical — one sort on the cached flags
+        display_matches = sorted(filtered, key=lambda m: (not m['_has_update'], m['_name_lower']))
+        # Rows are kept for the app's lifetime (iid = match key) and only detached/moved,
+        # so filtering costs Tcl calls for what changed rather than a full rebuild
+        visible = []
         for match in display_matches:
-            appid = str(match["data"]["appid"])
+            key = match["key"]
             game_name = match["game_name"]
-            local_data = self.last_applied.get(appid, {}).get(game_name, {})
-            local_file = local_data.get("file")
-            update_available = False
-            if local_file:
-                file_still_exists = any(local_file == f["name"] for f in match["data"]["files"])
-                update_available = not file_still_exists
-            if update_available:
-                display_name = f"★ {game_name}"
-                tags = (appid, "update")
+            if match['_has_update']:
+                row = ((f"★ {game_name}",), (key, "update"))
             else:
-                display_name = game_name
-                tags = (appid,)
-            self.tree.insert("", "end", values=(display_name,), tags=tags)
+                row = ((game_name,), (key,))
+            if key not in self._tree_rows:
+                self.tree.insert("", "end", iid=key, values=row[0], tags=row[1])
+            elif self._tree_rows[key] != row:
+                self.tree.item(key, values=row[0], tags=row[1])
+            self._tree_rows[key] = row
+            visible.append(key)
+        current = self.tree.get_children()
+        if tuple(visible) != current:
+            shown = set(visible)
+            hidden = [iid for iid in current if iid not in shown]
+            if hidden:
+                self.tree.detach(*hidden)
+            for index, iid in enumerate(visible):
+                self.tree.move(iid, "", index)
         # THIS LINE IS REQUIRED IN FILTER_GAMES TOO!
         self.tree.tag_configure("update", foreground="#e67e22", font=get_app_font(11, "bold"))
         if not self.tree.get_children():
             self.clear_details()
 
+    def update_match_flags(self):
+        """Cache per-match search/sort keys; call again whenever last_applied changes."""
+        for match in self.matches:
+            appid = match["appid"]
+            local_file = self.last_applied.get(appid, {}).get(match["game_name"], {}).get("file")
+            # If the file the user applied no longer exists in the current database → it was replaced → UPDATE!
+            match['_has_update'] = bool(local_file) and not any(local_file == f["name"] for f in match["data"]["files"])
+            match['_name_lower'] = match["game_name"].lower()
+
+    def get_box_art(self, appid):
+        """Box art for appid, reusing the rendered image until the chosen file changes."""
+        best = find_box_art(self.steam_path, appid)
+        key = box_art_key(best)
+        cached = self._boxart_cache.get(appid)
+        if cached and cached[0] == key:
+            self._boxart_cache.move_to_end(appid)
+            _, img, photo = cached
+            if photo is None:
+                # Prefetched composite: upload to Tk only now that it is actually shown
+                photo = ImageTk.PhotoImage(img)
+                self._boxart_cache[appid] = (key, img, photo)
+            return photo
+        img = compose_box_art(best)
+        photo = ImageTk.PhotoImage(img)
+        self._store_box_art(appid, key, img, photo)
+        return photo
+
+    def _store_box_art(self, appid, key, img, photo=None):
+        self._boxart_cache[appid] = (key, img, photo)
+        if len(self._boxart_cache) > BOXART_CACHE_SIZE:
+            self._boxart_cache.popitem(last=False)
+
+    def _prefetch_box_art(self, appids):
+        """Worker: resolve and compose box art ahead of the user clicking through the list."""
+        for appid in appids:
+            if appid in self._boxart_cache:
+                continue
+            try:
+                best = find_box_art(self.steam_path, appid)
+                key = box_art_key(best)
+                img = compose_box_art(best)
+            except Exception as e:
+                logging.debug("Box art prefetch failed for %s: %s", appid, e)
+                continue
+            # The cache is owned by the Tk thread; hand the composite over there
+            try:
+                self.after(0, self._finish_prefetch, appid, key, img)
+            except (tk.TclError, RuntimeError):
+                return  # Window closed (or mainloop not running); nothing left to prefetch for
+
+    def _finish_prefetch(self, appid, key, img):
+        cached = self._boxart_cache.get(appid)
+        if not cached or cached[0] != key:
+            self._store_box_art(appid, key, img)
+
     def on_select(self, _):
         selected = self.tree.selection()
         if not selected:
@@ -1804,13 +2504,14 @@ class App(tk.Tk):
         if not tags:
             self.clear_details()
             return
-        appid = str(tags[0])
-        match = self.by_id.get(appid)
+        key = str(tags[0])
+        match = self.by_id.get(key)
         if not match:
             self.clear_details()
             return
+        appid = match["appid"]
         game_name = match["game_name"] # ← CRITICAL: define game_name
-        img = load_box_art(self.steam_path, appid)
+        img = self.get_box_art(appid)
         if img:
             self.img_label.configure(image=img, text="")
             self.img_label.image = img
@@ -1823,24 +2524,19 @@ class App(tk.Tk):
         local_data = self.last_applied.get(appid, {}).get(game_name, {})
         local_file = local_data.get("file")
         changes = local_data.get("changes", {})
-        update_available = False
-        if local_file:
-            # If the file the user applied no longer exists in the current database → it was replaced → UPDATE!
-            file_exists = any(local_file == f["name"] for f in match["data"]["files"])
-            update_available = not file_exists
-        else:
-            # First time seeing this game → show as available, not update
-            update_available = False
-        if update_available:
+        if match['_has_update']:
             patch_text = "UPDATE AVAILABLE\nA new patch has been released!"
             fg = "#e67e22"
         elif local_file:
             ow = len(changes.get("overwritten", []))
             ad = len(changes.get("added", []))
             sk = len(changes.get("skipped", [])) if changes.get("skipped") else 0
+            ident = len(changes.get("identical", [])) if changes.get("identical") else 0
             change_summary = f"{ow} overwritten, {ad} added"
             if sk > 0:
                 change_summary += f", {sk} skipped"
+            if ident > 0:
+                change_summary += f", {ident} already identical"
             patch_text = f"Latest applied:\n{local_file}\non {local_data.get('date', 'unknown')}\n\n{change_summary}"
             fg = "#4CAF50"
         else:
@@ -1851,6 +2547,7 @@ class App(tk.Tk):
         self.patch_status_label.config(wraplength=220)
         self.status_var.set(match['data'].get('store_status', 'N/A'))
         self.current_appid = appid
+        self.current_key = key
         self.current_install_dir = self.installed[appid]
         self.open_folder_btn.config(state=tk.NORMAL)
         self.open_gdrive_btn.config(state=tk.NORMAL)
@@ -1867,6 +2564,7 @@ class App(tk.Tk):
         self.open_gdrive_btn.config(state=tk.DISABLED)
         self.launch_btn.config(state=tk.DISABLED)
         self.current_appid = None
+        self.current_key = None
         self.current_install_dir = None
 
     def open_folder(self):
@@ -1878,7 +2576,7 @@ class App(tk.Tk):
     def open_gdrive_folder(self):
         if not self.current_appid:
             return
-        match = self.by_id.get(self.current_appid)
+        match = self.by_id.get(self.current_key)
         if not match:
             return
        
@@ -1904,6 +2602,8 @@ class App(tk.Tk):
             messagebox.showerror("Error", "No game selected")
 
     def reset_ui(self):
+        # Widgets are rebuilt per run and id() values get reused, so forget old throttle state
+        self._ui_last_put.clear()
         try:
             if hasattr(self, 'patch_btn') and self.patch_btn.winfo_exists():
                 self.patch_btn.config(state="normal", text="Patch Selected Game")
@@ -1937,25 +2637,15 @@ class App(tk.Tk):
 if __name__ == "__main__":
     setup_logging()
     ensure_7z_exe()
-    try:
-        import vdf
-    except:
-        subprocess.call([sys.executable, "-m", "pip", "install", "vdf"])
-        import vdf
-    try:
-        import gdown
-    except:
-        subprocess.call([sys.executable, "-m", "pip", "install", "gdown"])
-        import gdown
+    # gdown is imported (and installed if needed, source runs only) on first download
     # Add support for DOCX and PDF
     try:
         from docx import Document
     except:
         subprocess.call([sys.executable, "-m", "pip", "install", "python-docx"])
         from docx import Document
-    try:
-        import fitz  # PyMuPDF for PDF
-    except:
+    # PyMuPDF is only imported when a PDF is opened; at startup just make sure it is installed
+    # (frozen builds bundle it, and there sys.executable is the app rather than python)
+    if not getattr(sys, 'frozen', False) and importlib.util.find_spec("fitz") is None:
         subprocess.call([sys.executable, "-m", "pip", "install", "pymupdf"])
-        import fitz
     App().mainloop()
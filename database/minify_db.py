@@ -2,6 +2,11 @@ import json
 import os
 from pathlib import Path
 
+try:
+    import orjson  # Optional: several times faster, output is already compact UTF-8
+except ImportError:
+    orjson = None
+
 # --- Configuration ---
 INPUT_PATH = Path('database') / 'data' / 'patches_data.json'
 OUTPUT_PATH = Path('database') / 'data' / 'patches_database.json'
@@ -18,12 +23,12 @@ def minify_json_database(input_path: Path, output_path: Path):
 
     print(f"📥 Reading: {input_path}")
 
-    # 1. Load the JSON data
+    # 1. Load the JSON data (one unbuffered read; the byte count is the original size)
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        original_size = os.path.getsize(input_path)
+        raw = input_path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        original_size = len(raw)
         print(f"   Original size: {original_size:,} bytes")
     except json.JSONDecodeError as e:
         print(f"❌ Error: Failed to parse JSON: {e}")
@@ -33,11 +38,26 @@ def minify_json_database(input_path: Path, output_path: Path):
         return
 
     # 2. Minify and save to patches_database.json
+    # Encode in one call: json.dump() to a file goes through the pure-Python encoder
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        minified_size = len(payload)
+
+        # Most runs re-fetch identical data: leave the file (and its mtime) alone then
+        if output_path.exists() and output_path.stat().st_size == minified_size \
+                and output_path.read_bytes() == payload:
+            print("\n✅ Database unchanged, nothing to write")
+            print(f"   Minified size : {minified_size:,} bytes")
+            return
+
+        # Write beside the target and swap it in, so a failed run never leaves a truncated database
+        tmp_path = output_path.with_suffix('.tmp')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, output_path)
         
-        minified_size = os.path.getsize(output_path)
         reduction = original_size - minified_size
         percentage = (reduction / original_size) * 100 if original_size else 0
         